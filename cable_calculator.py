@@ -12,15 +12,100 @@
 
 from __future__ import annotations
 
+from array import array
+from bisect import bisect_left
 from dataclasses import dataclass
-from typing import List, NamedTuple, Optional
+from functools import lru_cache
+from typing import Any, NamedTuple, Optional, Tuple
 
-# Доступные длины патч-кордов (м), по возрастанию
-PATCH_CORD_OPTIONS_M: List[float] = [1.0, 1.5, 2.0, 3.0, 5.0, 7.5, 10.0, 15.0, 20.0]
+# Доступные длины патч-кордов (м), по возрастанию (порядок важен для bisect)
+PATCH_CORD_OPTIONS_M: Tuple[float, ...] = (1.0, 1.5, 2.0, 3.0, 5.0, 7.5, 10.0, 15.0, 20.0)
 
 MAX_UNIT = 50  # последний юнит в стойке
 DEFAULT_SAFETY_SLACK_M = 0.4  # страховочный запас по умолчанию (40 см)
 
+# Таблица длин внутри одной стойки (м), индекс — расстояние в юнитах
+_SAME_RACK_LUT = array(
+    "d",
+    [0.5] * 3      # 0–2
+    + [1.0] * 6    # 3–8
+    + [1.5] * 7    # 9–15
+    + [2.0] * 8    # 16–23
+    + [2.5] * 14   # 24–37
+    + [3.0] * 13,  # 38–50
+)
+
+# Вертикальные участки в стойках A и B (м), индекс — номер юнита (0 не используется)
+_VERTICAL_A_LUT = array("d", [0.0] + [0.04 * (MAX_UNIT - u) for u in range(1, MAX_UNIT + 1)])
+_VERTICAL_B_LUT = array(
+    "d",
+    [0.0]
+    + [
+        0.5 if MAX_UNIT - u <= 2 else (4 * (MAX_UNIT - u) + 70 + 30) / 100.0
+        for u in range(1, MAX_UNIT + 1)
+    ],
+)
+
+# Длина в кабель-канале (м), индекс — разница номеров стоек. 64 значения с запасом
+# покрывают ряд целиком (в плане стоек 02b03–02b18 разница не больше 15);
+# для больших разниц считаем по формуле.
+_CHANNEL_LUT = array("d", [0.0] + [(d * 50 + 100) / 100.0 for d in range(1, 64)])
+
+
+class _NumpyTables(NamedTuple):
+    """numpy и таблицы расчёта в виде ndarray (для пакетного расчёта и numba)."""
+    np: Any
+    options: Any
+    same_rack: Any
+    vertical_a: Any
+    vertical_b: Any
+    channel: Any
+    breakdown_dtype: Any
+
+
+@lru_cache(maxsize=1)
+def _numpy_tables() -> _NumpyTables:
+    """
+    Импортировать numpy и построить таблицы при первом пакетном расчёте.
+
+    Обычный поштучный расчёт (API, GUI, CLI) numpy не загружает.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        raise ImportError("Для пакетного расчёта нужен numpy: pip install numpy") from None
+
+    # Поля результата пакетного расчёта — как у CableLengthBreakdown
+    breakdown_dtype = np.dtype(
+        [
+            ("same_rack", np.bool_),
+            ("vertical_a_m", np.float64),
+            ("vertical_b_m", np.float64),
+            ("horizontal_m", np.float64),
+            ("raw_total_m", np.float64),
+            ("slack_added_m", np.float64),
+            ("rounded_total_m", np.float64),
+            ("recommended_patch_cord_m", np.float64),
+        ]
+    )
+    # Таблицы — представления тех же array('d'), без копирования
+    return _NumpyTables(
+        np=np,
+        options=np.array(PATCH_CORD_OPTIONS_M, dtype=np.float64),
+        same_rack=np.frombuffer(_SAME_RACK_LUT, dtype=np.float64),
+        vertical_a=np.frombuffer(_VERTICAL_A_LUT, dtype=np.float64),
+        vertical_b=np.frombuffer(_VERTICAL_B_LUT, dtype=np.float64),
+        channel=np.frombuffer(_CHANNEL_LUT, dtype=np.float64),
+        breakdown_dtype=breakdown_dtype,
+    )
+
+
+def __getattr__(name: str) -> Any:
+    # BREAKDOWN_DTYPE создаётся вместе с numpy — только при обращении
+    if name == "BREAKDOWN_DTYPE":
+        return _numpy_tables().breakdown_dtype
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 class ServerLocation(NamedTuple):
     """
@@ -45,6 +130,20 @@ class DataCenterCableConfig:
     safety_slack_m: float = DEFAULT_SAFETY_SLACK_M
 
 
+def _unit_index(unit: int) -> int:
+    """
+    Проверить номер юнита и вернуть его как индекс таблиц.
+
+    Целые значения в виде float (например, 5.0) допускаются; дробные — нет.
+    """
+    if not (1 <= unit <= MAX_UNIT):
+        raise ValueError(f"Юнит должен быть в диапазоне 1..{MAX_UNIT}")
+    index = int(unit)
+    if index != unit:
+        raise ValueError(f"Номер юнита должен быть целым числом, получено {unit}")
+    return index
+
+
 def _same_rack_length_m(unit_a: int, unit_b: int) -> float:
     """
     Длина кабеля внутри одной стойки по таблице (м).
@@ -57,47 +156,40 @@ def _same_rack_length_m(unit_a: int, unit_b: int) -> float:
     24–37 → 2.5 м
     38–50 → 3 м
     """
-    delta = abs(unit_a - unit_b)
-    if not (1 <= unit_a <= MAX_UNIT and 1 <= unit_b <= MAX_UNIT):
-        raise ValueError(f"Юнит должен быть в диапазоне 1..{MAX_UNIT}")
+    return _SAME_RACK_LUT[abs(_unit_index(unit_a) - _unit_index(unit_b))]
+
 
-    if delta <= 2:
-        return 0.5
-    if delta <= 8:
-        return 1.0
-    if delta <= 15:
-        return 1.5
-    if delta <= 23:
-        return 2.0
-    if delta <= 37:
-        return 2.5
-    return 3.0
-
-
-def _round_up_to_patch_cord(length_m: float) -> float:
-    """Округлить длину вверх до ближайшего доступного патч-корда."""
-    for opt in PATCH_CORD_OPTIONS_M:
-        if opt >= length_m:
-            return opt
-    return PATCH_CORD_OPTIONS_M[-1]
-
-
-def _round_to_nearest_patch_cord(length_m: float) -> float:
-    """Округлить длину до ближайшего доступного патч-корда. При равенстве — вверх."""
-    best = PATCH_CORD_OPTIONS_M[0]
-    best_dist = abs(best - length_m)
-    for opt in PATCH_CORD_OPTIONS_M:
-        d = abs(opt - length_m)
-        if d < best_dist or (d == best_dist and opt > best):
-            best, best_dist = opt, d
-    return best
+def _pick_patch_cord(raw_total_m: float, safety_slack_m: float) -> float:
+    """
+    Подобрать патч-корд для расчётной длины.
+
+    Округляем вверх до ближайшего из списка. Если запас до него >= страховочного,
+    пробуем (рекомендуемый - страховочный запас), округлённый до ближайшего
+    (при равенстве — вверх), но не короче расчётной длины.
+    """
+    options = PATCH_CORD_OPTIONS_M
+    i = bisect_left(options, raw_total_m)
+    if i == len(options):
+        return options[-1]
+    recommended = options[i]
+    if safety_slack_m <= 0 or recommended - raw_total_m < safety_slack_m:
+        return recommended
+
+    candidate = recommended - safety_slack_m
+    j = bisect_left(options, candidate)  # candidate < recommended, поэтому j <= i
+    if j == 0:
+        shorter = options[0]
+    else:
+        upper = options[j]
+        lower = options[j - 1]
+        # upper >= candidate > lower, при равенстве расстояний берём upper
+        shorter = upper if upper - candidate <= candidate - lower else lower
+    return shorter if shorter >= raw_total_m else recommended
 
 
 def _vertical_in_rack_a_m(unit_a: int) -> float:
     """Длина в стойке A: 4 см на каждый юнит от сервера до верха (50). В метрах."""
-    if not (1 <= unit_a <= MAX_UNIT):
-        raise ValueError(f"Юнит должен быть в диапазоне 1..{MAX_UNIT}")
-    return 0.04 * (MAX_UNIT - unit_a)
+    return _VERTICAL_A_LUT[_unit_index(unit_a)]
 
 
 def _cable_channel_m(rack_a: int, rack_b: int) -> float:
@@ -106,8 +198,9 @@ def _cable_channel_m(rack_a: int, rack_b: int) -> float:
     Пример: из 1 в 2 стойку → 1; из 1 в 5 → 4.
     """
     rack_delta = abs(rack_b - rack_a)
-    if rack_delta == 0:
-        return 0.0
+    # Таблица индексируется только целым; дробную разницу считаем по формуле
+    if rack_delta < len(_CHANNEL_LUT) and rack_delta == int(rack_delta):
+        return _CHANNEL_LUT[int(rack_delta)]
     return (rack_delta * 50 + 100) / 100.0  # см → м
 
 
@@ -117,12 +210,7 @@ def _vertical_in_rack_b_m(unit_b: int) -> float:
     Если 1–2 юнита от верха (50 - unit_b <= 2) → 0.5 м.
     Иначе: 4*(50 - unit_b) + 70 + 30 см = 4*(50 - unit_b) + 100 см. В метрах.
     """
-    if not (1 <= unit_b <= MAX_UNIT):
-        raise ValueError(f"Юнит должен быть в диапазоне 1..{MAX_UNIT}")
-    units_from_top = MAX_UNIT - unit_b
-    if units_from_top <= 2:
-        return 0.5
-    return (4 * units_from_top + 70 + 30) / 100.0  # см → м
+    return _VERTICAL_B_LUT[_unit_index(unit_b)]
 
 
 @dataclass(frozen=True)
@@ -141,6 +229,54 @@ class CableLengthBreakdown:
     recommended_patch_cord_m: float
 
 
+def calculate_patch_cord_breakdown_fast(
+    rack_a: int,
+    unit_a: int,
+    rack_b: int,
+    unit_b: int,
+    safety_slack_m: float = DEFAULT_SAFETY_SLACK_M,
+) -> Tuple[bool, float, float, float, float, float, float, float]:
+    """
+    То же, что calculate_patch_cord_breakdown, но без промежуточных объектов.
+
+    Принимает номера стоек/юнитов и запас в метрах, возвращает кортеж полей
+    CableLengthBreakdown в том же порядке: (same_rack, vertical_a_m,
+    vertical_b_m, horizontal_m, raw_total_m, slack_added_m, rounded_total_m,
+    recommended_patch_cord_m).
+    """
+    same_rack = rack_a == rack_b
+    safety_slack_m = max(0.0, float(safety_slack_m))
+
+    if same_rack:
+        raw_total = _same_rack_length_m(unit_a, unit_b)
+        vertical_a = raw_total  # для визуализации показываем как один вертикальный отрезок
+        vertical_b = 0.0
+        horizontal = 0.0
+        slack_added = 0.0
+    else:
+        vertical_a = _vertical_in_rack_a_m(unit_a)
+        horizontal = _cable_channel_m(rack_a, rack_b)
+        vertical_b = _vertical_in_rack_b_m(unit_b)
+        raw_total = vertical_a + horizontal + vertical_b + safety_slack_m
+        slack_added = safety_slack_m
+
+    recommended = _pick_patch_cord(raw_total, safety_slack_m)
+
+    return (
+        same_rack,
+        vertical_a,
+        vertical_b,
+        horizontal,
+        raw_total,
+        slack_added,
+        recommended,
+        recommended,
+    )
+
+
+# Результат — неизменяемый CableLengthBreakdown, поэтому повторные запросы
+# берём из кэша. Размер ограничен: запас приходит из API произвольным числом.
+@lru_cache(maxsize=65536)
 def calculate_patch_cord_breakdown(
     server_a: ServerLocation,
     server_b: ServerLocation,
@@ -154,41 +290,75 @@ def calculate_patch_cord_breakdown(
     пробуем (рекоменд - страховочный запас) с округлением до ближайшего,
     без уменьшения ниже расчётной длины.
     """
-    same_rack = server_a.rack == server_b.rack
     effective_cfg = cfg if cfg is not None else DataCenterCableConfig()
-    safety_slack_m = max(0.0, float(effective_cfg.safety_slack_m))
+    return CableLengthBreakdown(
+        *calculate_patch_cord_breakdown_fast(
+            server_a.rack,
+            server_a.unit,
+            server_b.rack,
+            server_b.unit,
+            effective_cfg.safety_slack_m,
+        )
+    )
 
-    if same_rack:
-        raw_total = _same_rack_length_m(server_a.unit, server_b.unit)
-        vertical_a = raw_total  # для визуализации показываем как один вертикальный отрезок
-        vertical_b = 0.0
-        horizontal = 0.0
-        slack_added = 0.0
+
+# Сброс кэша расчётов (например, в тестах или после смены таблиц)
+cache_clear = calculate_patch_cord_breakdown.cache_clear
+
+
+def _pair_kernel_impl(
+    rack_a, unit_a, rack_b, unit_b, safety_slack_m,
+    same_rack_lut, vertical_a_lut, vertical_b_lut, channel_lut, options,
+):
+    """
+    Та же арифметика, что в calculate_patch_cord_breakdown_fast, без кортежа.
+
+    Компилируется numba в _jit_pair_kernel(); вариант патч-корда ищем
+    простым проходом по короткому списку, как bisect_left.
+    Юниты должны быть уже проверены вызывающим кодом.
+    """
+    if rack_a == rack_b:
+        raw_total = same_rack_lut[abs(unit_a - unit_b)]
     else:
-        vertical_a = _vertical_in_rack_a_m(server_a.unit)
-        horizontal = _cable_channel_m(server_a.rack, server_b.rack)
-        vertical_b = _vertical_in_rack_b_m(server_b.unit)
-        raw_total = vertical_a + horizontal + vertical_b + safety_slack_m
-        slack_added = safety_slack_m
+        rack_delta = abs(rack_b - rack_a)
+        if rack_delta < len(channel_lut) and rack_delta == int(rack_delta):
+            horizontal = channel_lut[int(rack_delta)]
+        else:
+            horizontal = (rack_delta * 50 + 100) / 100.0
+        raw_total = vertical_a_lut[unit_a] + horizontal + vertical_b_lut[unit_b] + safety_slack_m
+
+    n = len(options)
+    i = 0
+    while i < n and options[i] < raw_total:
+        i += 1
+    if i == n:
+        return options[n - 1]
+    recommended = options[i]
+    if safety_slack_m <= 0 or recommended - raw_total < safety_slack_m:
+        return recommended
+
+    candidate = recommended - safety_slack_m
+    j = 0
+    while options[j] < candidate:  # candidate < recommended, поэтому j <= i
+        j += 1
+    if j == 0:
+        shorter = options[0]
+    else:
+        upper = options[j]
+        lower = options[j - 1]
+        # upper >= candidate > lower, при равенстве расстояний берём upper
+        shorter = upper if upper - candidate <= candidate - lower else lower
+    return shorter if shorter >= raw_total else recommended
 
-    recommended = _round_up_to_patch_cord(raw_total)
-    gap = recommended - raw_total
-    if safety_slack_m > 0 and gap >= safety_slack_m:
-        candidate = recommended - safety_slack_m
-        shorter = _round_to_nearest_patch_cord(candidate)
-        if shorter >= raw_total:
-            recommended = shorter
 
-    return CableLengthBreakdown(
-        same_rack=same_rack,
-        vertical_a_m=vertical_a,
-        vertical_b_m=vertical_b,
-        horizontal_m=horizontal,
-        raw_total_m=raw_total,
-        slack_added_m=slack_added,
-        rounded_total_m=recommended,
-        recommended_patch_cord_m=recommended,
-    )
+@lru_cache(maxsize=1)
+def _jit_pair_kernel():
+    """Скомпилировать ядро numba при первом вызове (numba импортируем только здесь)."""
+    try:
+        import numba
+    except ImportError:
+        raise ImportError("Для расчёта через numba нужен пакет numba: pip install numba") from None
+    return numba.njit(cache=True)(_pair_kernel_impl)
 
 
 def calculate_patch_cord_length_m(
@@ -199,3 +369,140 @@ def calculate_patch_cord_length_m(
     """Вернуть рекомендуемую длину патч-корда (м)."""
     breakdown = calculate_patch_cord_breakdown(server_a, server_b, cfg)
     return breakdown.recommended_patch_cord_m
+
+
+def calculate_patch_cord_length_m_jit(
+    server_a: ServerLocation,
+    server_b: ServerLocation,
+    cfg: Optional[DataCenterCableConfig] = None,
+) -> float:
+    """
+    То же, что calculate_patch_cord_length_m, но через ядро numba.
+
+    Имеет смысл при вызове в цикле по множеству пар серверов: первый вызов
+    импортирует numba и компилирует ядро (или читает его из кэша на диске),
+    что дороже одиночного расчёта. Требует numpy и numba.
+    """
+    kernel = _jit_pair_kernel()
+    tables = _numpy_tables()
+    unit_a = _unit_index(server_a.unit)
+    unit_b = _unit_index(server_b.unit)
+    effective_cfg = cfg if cfg is not None else DataCenterCableConfig()
+    safety_slack_m = max(0.0, float(effective_cfg.safety_slack_m))
+    return float(
+        kernel(
+            server_a.rack, unit_a, server_b.rack, unit_b, safety_slack_m,
+            tables.same_rack, tables.vertical_a, tables.vertical_b,
+            tables.channel, tables.options,
+        )
+    )
+
+
+def _bulk_racks(np, racks):
+    """Массив номеров стоек: целые — int64, дробные остаются float64."""
+    racks = np.asarray(racks)
+    if racks.dtype.kind == "f":
+        return racks.astype(np.float64)
+    return racks.astype(np.int64)
+
+
+def _bulk_units(np, units):
+    """Проверить массив юнитов (как _unit_index) и вернуть его как int64."""
+    if not np.all((units >= 1) & (units <= MAX_UNIT)):
+        raise ValueError(f"Юнит должен быть в диапазоне 1..{MAX_UNIT}")
+    index = units.astype(np.int64)
+    if not np.array_equal(index, units):
+        raise ValueError("Номер юнита должен быть целым числом")
+    return index
+
+
+def calculate_patch_cord_breakdown_bulk(
+    racks_a,
+    units_a,
+    racks_b,
+    units_b,
+    cfg: Optional[DataCenterCableConfig] = None,
+):
+    """
+    Пакетный расчёт детализации для массивов пар серверов.
+
+    Принимает четыре массива одинаковой длины (стойка и юнит для серверов
+    A и B; юниты — целые) и возвращает структурированный массив BREAKDOWN_DTYPE:
+    по строке на пару, поля совпадают с CableLengthBreakdown. Требует numpy.
+    """
+    tables = _numpy_tables()
+    np = tables.np
+
+    # Как и в скалярном расчёте: дробные стойки допустимы (считаются по
+    # формуле), юниты должны быть целыми — молча их не округляем
+    racks_a, units_a, racks_b, units_b = np.broadcast_arrays(
+        _bulk_racks(np, racks_a), np.asarray(units_a), _bulk_racks(np, racks_b), np.asarray(units_b)
+    )
+    units_a = _bulk_units(np, units_a)
+    units_b = _bulk_units(np, units_b)
+
+    effective_cfg = cfg if cfg is not None else DataCenterCableConfig()
+    safety_slack_m = max(0.0, float(effective_cfg.safety_slack_m))
+
+    out = np.empty(racks_a.shape, dtype=tables.breakdown_dtype)
+    same_rack = racks_a == racks_b
+    out["same_rack"] = same_rack
+
+    # Одна стойка: таблица; весь путь показываем как вертикальный участок A
+    same_rack_total = tables.same_rack[np.abs(units_a - units_b)]
+    out["vertical_a_m"] = np.where(same_rack, same_rack_total, tables.vertical_a[units_a])
+    out["vertical_b_m"] = np.where(same_rack, 0.0, tables.vertical_b[units_b])
+    rack_delta = np.abs(racks_b - racks_a)
+    in_lut = (rack_delta < len(tables.channel)) & (rack_delta == np.floor(rack_delta))
+    horizontal = np.where(
+        in_lut,
+        tables.channel[np.where(in_lut, rack_delta, 0).astype(np.int64)],
+        (rack_delta * 50 + 100) / 100.0,
+    )
+    out["horizontal_m"] = np.where(same_rack, 0.0, horizontal)
+    out["slack_added_m"] = np.where(same_rack, 0.0, safety_slack_m)
+
+    # Разные стойки: стойка A + кабель-канал + стойка B + страховочный запас
+    raw_total = np.where(
+        same_rack,
+        same_rack_total,
+        out["vertical_a_m"] + out["horizontal_m"] + out["vertical_b_m"] + safety_slack_m,
+    )
+    out["raw_total_m"] = raw_total
+
+    options = tables.options
+    last = len(options) - 1
+
+    # Округление вверх до патч-корда из списка
+    recommended = options[np.minimum(np.searchsorted(options, raw_total, side="left"), last)]
+
+    # Пробуем патч-корд короче: (рекомендуемый - запас) до ближайшего, при равенстве — вверх
+    if safety_slack_m > 0:
+        candidate = recommended - safety_slack_m
+        j = np.searchsorted(options, candidate, side="left")
+        upper = options[np.minimum(j, last)]
+        lower = options[np.maximum(j - 1, 0)]
+        shorter = np.where(upper - candidate <= candidate - lower, upper, lower)
+        use_shorter = (recommended - raw_total >= safety_slack_m) & (shorter >= raw_total)
+        recommended = np.where(use_shorter, shorter, recommended)
+
+    out["rounded_total_m"] = recommended
+    out["recommended_patch_cord_m"] = recommended
+    return out
+
+
+def calculate_patch_cord_length_bulk(
+    racks_a,
+    units_a,
+    racks_b,
+    units_b,
+    cfg: Optional[DataCenterCableConfig] = None,
+):
+    """
+    Пакетный расчёт рекомендуемых патч-кордов (м) для массивов пар серверов.
+
+    Возвращает массив float64 с тем же результатом, что и
+    calculate_patch_cord_length_m для каждой пары. Требует numpy.
+    """
+    breakdown = calculate_patch_cord_breakdown_bulk(racks_a, units_a, racks_b, units_b, cfg)
+    return breakdown["recommended_patch_cord_m"].copy()
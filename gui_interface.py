@@ -3,9 +3,12 @@ GUI интерфейс на tkinter для расчёта длины патч-к
 Использование: python gui_interface.py
 """
 
+import functools
+import math
 import tkinter as tk
 from tkinter import ttk, messagebox
 from cable_calculator import (
+    DEFAULT_SAFETY_SLACK_M,
     ServerLocation,
     DataCenterCableConfig,
     calculate_patch_cord_length_m,
@@ -19,6 +22,10 @@ class CableCalculatorGUI:
         self.root.geometry("500x600")
         self.root.resizable(False, False)
 
+        # Последние введённые значения: повторное нажатие без изменений не пересчитывает
+        self._last_inputs = None
+        self._calc = functools.lru_cache(maxsize=1024)(calculate_patch_cord_length_m)
+
         # Стиль
         style = ttk.Style()
         style.theme_use("clam")
@@ -106,22 +113,14 @@ class CableCalculatorGUI:
         )
         config_frame.pack(fill=tk.X, pady=10)
 
-        tk.Label(config_frame, text="Коэффициент запаса:", font=("Arial", 9)).grid(
+        tk.Label(config_frame, text="Страховочный запас (см):", font=("Arial", 9)).grid(
             row=0, column=0, sticky=tk.W, pady=5
         )
-        self.slack_var = tk.StringVar(value="1.10")
+        self.slack_var = tk.StringVar(value=f"{DEFAULT_SAFETY_SLACK_M * 100:g}")
         tk.Entry(config_frame, textvariable=self.slack_var, width=15).grid(
             row=0, column=1, padx=10, pady=5
         )
 
-        tk.Label(config_frame, text="Шаг округления (м):", font=("Arial", 9)).grid(
-            row=1, column=0, sticky=tk.W, pady=5
-        )
-        self.rounding_var = tk.StringVar(value="0.5")
-        tk.Entry(config_frame, textvariable=self.rounding_var, width=15).grid(
-            row=1, column=1, padx=10, pady=5
-        )
-
         # Кнопка расчёта
         calculate_btn = tk.Button(
             main_frame,
@@ -177,30 +176,28 @@ class CableCalculatorGUI:
                 messagebox.showerror("Ошибка", "Номер юнита должен быть от 1 до 50")
                 return
 
-            # Создаём серверы
-            server_a = ServerLocation(rack=rack1, unit=unit1)
-            server_b = ServerLocation(rack=rack2, unit=unit2)
-
-            # Создаём конфигурацию
-            config_kwargs = {}
             try:
-                slack = float(self.slack_var.get())
-                if slack > 0:
-                    config_kwargs["slack_factor"] = slack
+                slack_cm = float(self.slack_var.get().replace(",", "."))
             except ValueError:
-                pass
+                slack_cm = -1.0
+            if not math.isfinite(slack_cm) or slack_cm < 0:
+                messagebox.showerror("Ошибка", "Страховочный запас должен быть числом не меньше 0")
+                return
 
-            try:
-                rounding = float(self.rounding_var.get())
-                if rounding > 0:
-                    config_kwargs["rounding_step_m"] = rounding
-            except ValueError:
-                pass
+            inputs = (rack1, unit1, rack2, unit2, slack_cm)
+            if inputs == self._last_inputs:
+                # Ничего не изменилось — результат уже на экране
+                self.result_frame.pack(fill=tk.X, pady=10)
+                return
+
+            # Создаём серверы
+            server_a = ServerLocation(rack=rack1, unit=unit1)
+            server_b = ServerLocation(rack=rack2, unit=unit2)
 
-            cfg = DataCenterCableConfig(**config_kwargs)
+            cfg = DataCenterCableConfig(safety_slack_m=slack_cm / 100.0)
 
             # Рассчитываем
-            length = calculate_patch_cord_length_m(server_a, server_b, cfg)
+            length = self._calc(server_a, server_b, cfg)
 
             # Показываем результат
             self.result_label.config(text=f"Длина патч-корда: {length:.2f} м")
@@ -208,6 +205,7 @@ class CableCalculatorGUI:
                 text=f"Стойка {rack1}, Юнит {unit1} → Стойка {rack2}, Юнит {unit2}"
             )
             self.result_frame.pack(fill=tk.X, pady=10)
+            self._last_inputs = inputs
 
         except ValueError as e:
             messagebox.showerror("Ошибка валидации", str(e))
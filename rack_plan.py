@@ -12,15 +12,17 @@
   вдоль ряда (1, 2, 3, ...) только для нужного диапазона стоек.
 
 При необходимости можно скорректировать функцию _detect_rack_column().
+Если установлен python-calamine, Excel читается им, иначе — openpyxl.
 """
 
 from __future__ import annotations
 
+import re
+import zipfile
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
-
-from openpyxl import load_workbook
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
 
 
 EXCEL_FILE_NAME = "racks-condition (10).xlsx"
@@ -29,6 +31,12 @@ EXCEL_FILE_NAME = "racks-condition (10).xlsx"
 RACK_CODE_START = "02b03"
 RACK_CODE_END = "02b18"
 
+# Сколько первых строк листа просматриваем в поисках заголовка
+_MAX_HEADER_ROWS = 10
+
+# Индекс активного листа в xl/workbook.xml
+_ACTIVE_TAB_RE = re.compile(rb'<workbookView\b[^>]*\bactiveTab="(\d+)"')
+
 
 @dataclass(frozen=True)
 class RackInfo:
@@ -38,26 +46,71 @@ class RackInfo:
     index: int  # порядковый индекс в ряду (1, 2, 3, ...)
 
 
-def _detect_rack_column(sheet) -> Optional[int]:
+def _detect_rack_column(row: Sequence[object]) -> Optional[int]:
     """
-    Попытаться автоматически определить индекс колонки с именем стойки.
+    Попытаться определить индекс колонки с именем стойки по строке значений.
 
-    Стратегия:
-    - просматриваем первые 10 строк;
-    - ищем ячейку, где в тексте встречается подстрока 'rack' (без регистра);
-    - возвращаем номер колонки (1-based) или None.
+    Ищем ячейку, где в тексте встречается подстрока 'rack' (без регистра),
+    и возвращаем номер колонки (1-based) или None.
+    Вызывается для первых _MAX_HEADER_ROWS строк листа.
     """
-    max_header_rows = 10
-
-    for row in sheet.iter_rows(min_row=1, max_row=max_header_rows):
-        for cell in row:
-            value = str(cell.value).strip() if cell.value is not None else ""
-            if value and "rack" in value.lower():
-                return cell.column
+    for col_idx, cell_value in enumerate(row, start=1):
+        value = str(cell_value).strip() if cell_value is not None else ""
+        if value and "rack" in value.lower():
+            return col_idx
 
     return None
 
 
+def _active_sheet_index(excel_path: Path) -> int:
+    """
+    Вернуть индекс активного листа книги .xlsx (атрибут activeTab).
+
+    python-calamine не сообщает, какой лист активен, поэтому читаем
+    xl/workbook.xml напрямую. Если прочитать не удалось, считаем
+    активным первый лист (так же поступает openpyxl).
+    """
+    try:
+        with zipfile.ZipFile(excel_path) as archive:
+            workbook_xml = archive.read("xl/workbook.xml")
+    except (OSError, KeyError, zipfile.BadZipFile):
+        return 0
+
+    m = _ACTIVE_TAB_RE.search(workbook_xml)
+    return int(m.group(1)) if m else 0
+
+
+def _iter_sheet_rows(excel_path: Path) -> Iterator[Sequence[object]]:
+    """
+    Построчно отдать значения ячеек активного листа с планом стоек.
+
+    Если установлен python-calamine и активен первый лист, читаем им (Rust,
+    без создания объектов ячеек). Иначе — openpyxl в режиме read_only
+    (потоковый разбор активного листа без стилей).
+    """
+    try:
+        from python_calamine import CalamineWorkbook
+    except ImportError:
+        CalamineWorkbook = None
+
+    if CalamineWorkbook is None or _active_sheet_index(excel_path) != 0:
+        # openpyxl импортируем только здесь: это заметная часть времени старта
+        from openpyxl import load_workbook
+
+        wb = load_workbook(excel_path, read_only=True, data_only=True)
+        try:
+            yield from wb.active.iter_rows(values_only=True)
+        finally:
+            wb.close()
+        return
+
+    workbook = CalamineWorkbook.from_path(str(excel_path))
+    # skip_empty_area=False: не отбрасывать пустые строки перед данными,
+    # иначе поиск заголовка в первых _MAX_HEADER_ROWS строках считал бы
+    # строки не так, как openpyxl
+    yield from workbook.get_sheet_by_index(0).to_python(skip_empty_area=False)
+
+
 def _parse_rack_code(code: str) -> Tuple[str, int]:
     """
     Разобрать код стойки вида '02b05' на (префикс, число).
@@ -80,25 +133,26 @@ def _parse_rack_code(code: str) -> Tuple[str, int]:
     return prefix, number
 
 
-def _is_in_interesting_range(code: str) -> bool:
-    """Проверить, попадает ли код стойки в диапазон 02b03–02b18."""
-    if not code:
-        return False
-
-    # Нормализуем к нижнему регистру
-    code = code.strip()
-    start = RACK_CODE_START.strip()
-    end = RACK_CODE_END.strip()
+# Границы диапазона разбираем один раз при импорте
+_RANGE_PREFIX, _RANGE_START = _parse_rack_code(RACK_CODE_START)
+_, _RANGE_END = _parse_rack_code(RACK_CODE_END)
 
-    # Быстрая проверка по префиксу
-    p_code, n_code = _parse_rack_code(code)
-    p_start, n_start = _parse_rack_code(start)
-    p_end, n_end = _parse_rack_code(end)
+# Код стойки из диапазона: префикс (без учёта регистра) + две цифры
+_RANGE_RE = re.compile(rf"{re.escape(_RANGE_PREFIX)}(\d{{2}})", re.IGNORECASE)
 
-    if p_code.lower() != p_start.lower() or p_code.lower() != p_end.lower():
-        return False
 
-    return n_start <= n_code <= n_end
+def _interesting_rack_number(code: str) -> Optional[int]:
+    """
+    Вернуть числовую часть кода стойки, если он из диапазона 02b03–02b18,
+    иначе None.
+    """
+    m = _RANGE_RE.fullmatch(code.strip())
+    if m is None:
+        return None
+    number = int(m.group(1))
+    if not (_RANGE_START <= number <= _RANGE_END):
+        return None
+    return number
 
 
 def generate_default_rack_plan() -> Tuple[List[RackInfo], Dict[str, RackInfo]]:
@@ -108,15 +162,12 @@ def generate_default_rack_plan() -> Tuple[List[RackInfo], Dict[str, RackInfo]]:
     Используется как резервный вариант, если файл Excel отсутствует
     или его структура неожиданная.
     """
-    prefix, start_num = _parse_rack_code(RACK_CODE_START)
-    _, end_num = _parse_rack_code(RACK_CODE_END)
-
     rack_infos: List[RackInfo] = []
     code_to_info: Dict[str, RackInfo] = {}
 
     idx = 1
-    for n in range(start_num, end_num + 1):
-        code = f"{prefix}{n:02d}"
+    for n in range(_RANGE_START, _RANGE_END + 1):
+        code = f"{_RANGE_PREFIX}{n:02d}"
         info = RackInfo(code=code, index=idx)
         rack_infos.append(info)
         code_to_info[code] = info
@@ -134,6 +185,10 @@ def load_rack_plan(
     - словарь code -> RackInfo.
 
     Если файл или нужная колонка не найдены, будет выброшено исключение.
+
+    Результат кэшируется по пути и времени изменения файла: повторный вызов
+    стоит одного stat(), а правка Excel сбрасывает кэш. Возвращаемые список
+    и словарь общие для всех вызовов — не изменяйте их.
     """
     if base_dir is None:
         base_dir = Path(__file__).resolve().parent
@@ -147,10 +202,36 @@ def load_rack_plan(
             f"Скорректируйте EXCEL_FILE_NAME в rack_plan.py."
         )
 
-    wb = load_workbook(excel_path, data_only=True)
-    sheet = wb.active
+    return _load_rack_plan_cached(excel_path, excel_path.stat().st_mtime_ns)
+
+
+@lru_cache(maxsize=8)
+def _load_rack_plan_cached(
+    excel_path: Path,
+    mtime_ns: int,
+) -> Tuple[List[RackInfo], Dict[str, RackInfo]]:
+    """Прочитать план стоек из Excel; mtime_ns нужен только как ключ кэша."""
+    # Один проход по листу: сначала ищем строку заголовка с колонкой стойки,
+    # затем собираем коды стоек из всех строк ниже неё.
+    # Числовая часть -> код; при повторах оставляем первое написание
+    rack_col: Optional[int] = None
+    codes_by_number: Dict[int, str] = {}
+
+    for row_number, row in enumerate(_iter_sheet_rows(excel_path), start=1):
+        if rack_col is None:
+            if row_number > _MAX_HEADER_ROWS:
+                break
+            rack_col = _detect_rack_column(row)
+            continue
+
+        # Коды стоек — строки; пустые ячейки (None или '') и числа пропускаем
+        value = row[rack_col - 1] if rack_col <= len(row) else None
+        if not isinstance(value, str):
+            continue
+        number = _interesting_rack_number(value)
+        if number is not None:
+            codes_by_number.setdefault(number, value.strip())
 
-    rack_col = _detect_rack_column(sheet)
     if rack_col is None:
         raise RuntimeError(
             "Не удалось автоматически определить колонку с кодом стойки. "
@@ -158,43 +239,12 @@ def load_rack_plan(
             "обновите функцию _detect_rack_column()."
         )
 
-    # Собираем все коды стоек
-    rack_codes: List[str] = []
-    header_row_detected = False
-    header_row_index: Optional[int] = None
-
-    # Сначала найдём строку заголовка (там, где находится rack_col)
-    max_header_rows = 10
-    for row in sheet.iter_rows(min_row=1, max_row=max_header_rows):
-        cell = row[rack_col - 1]
-        value = str(cell.value).strip() if cell.value is not None else ""
-        if value and "rack" in value.lower():
-            header_row_detected = True
-            header_row_index = cell.row
-            break
-
-    if not header_row_detected or header_row_index is None:
-        # fallback: считаем, что заголовок в первой строке
-        header_row_index = 1
-
-    # Теперь читаем все значения ниже заголовка
-    for row in sheet.iter_rows(min_row=header_row_index + 1):
-        cell = row[rack_col - 1]
-        if cell.value is None:
-            continue
-        code = str(cell.value).strip()
-        if not code:
-            continue
-        if _is_in_interesting_range(code):
-            rack_codes.append(code)
-
-    # Удаляем дубликаты и сортируем по числовой части
-    unique_codes = sorted(set(rack_codes), key=lambda c: _parse_rack_code(c)[1])
-
     rack_infos: List[RackInfo] = []
     code_to_info: Dict[str, RackInfo] = {}
 
-    for idx, code in enumerate(unique_codes, start=1):
+    # Индексы — по возрастанию числовой части кода
+    for idx, number in enumerate(sorted(codes_by_number), start=1):
+        code = codes_by_number[number]
         info = RackInfo(code=code, index=idx)
         rack_infos.append(info)
         code_to_info[code] = info
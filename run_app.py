@@ -9,26 +9,42 @@
 2. Запускает HTTP-сервер для веб-интерфейса на порту 8080
 3. Открывает браузер с веб-интерфейсом
 4. Всё работает до закрытия окна (Ctrl+C)
+
+API работает в потоке этого же процесса, отдельный интерпретатор не нужен.
 """
 
 from __future__ import annotations
 
-import http.server
+import functools
 import os
-import socketserver
-import subprocess
+import signal
 import sys
 import threading
 import time
-import webbrowser
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+# http.server и webbrowser импортируем по месту:
+# до первого вывода в консоль загружается только необходимое.
+if TYPE_CHECKING:
+    import http.server
 
 
 # Порты
 API_PORT = 8000
 WEB_PORT = 8080
 
+# Задержка перед открытием браузера. Порт веб-сервера к этому моменту
+# уже слушается, поэтому ждать не нужно.
+BROWSER_OPEN_DELAY_S = 0.0
+
+# Сигнал остановки: выставляется по Ctrl+C или при завершении потока API.
+_shutdown = threading.Event()
+
+# На Windows ожидание Event не прерывается Ctrl+C, поэтому там ждём
+# с таймаутом, чтобы интерпретатор успевал обработать сигнал.
+_SHUTDOWN_WAIT_S = 0.5 if os.name == "nt" else None
+
 
 def get_runtime_root() -> Path:
     """
@@ -46,106 +62,183 @@ def get_runtime_root() -> Path:
     return Path(__file__).resolve().parent
 
 
-class CustomHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
-    """HTTP обработчик с поддержкой CORS для веб-интерфейса."""
-    
-    def end_headers(self):
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
-        super().end_headers()
-    
-    def log_message(self, format, *args):
-        # Отключаем логирование каждого запроса для чистоты консоли
-        pass
+# Файлы веб-интерфейса, которые держим в памяти (каталог проекта и assets/)
+_STATIC_PATTERNS = ("*.html", "*.css", "*.js", "*.ico", "assets/*")
 
 
-def start_web_server(project_root: Path, port: int) -> socketserver.TCPServer:
-    """Запустить HTTP-сервер для раздачи HTML файла."""
-    os.chdir(str(project_root))
-    handler = CustomHTTPRequestHandler
-    httpd = socketserver.TCPServer(("", port), handler)
-    
-    def serve():
-        print(f"Веб-сервер запущен на http://localhost:{port}")
-        httpd.serve_forever()
+def _load_static_files(project_root: Path) -> dict[str, tuple[bytes, str, str]]:
+    """
+    Прочитать файлы веб-интерфейса в память.
+
+    Возвращает словарь: относительный путь -> (содержимое, ETag, Content-Type).
+    """
+    import hashlib
+    import mimetypes
+
+    static_files: dict[str, tuple[bytes, str, str]] = {}
+    for pattern in _STATIC_PATTERNS:
+        for path in project_root.glob(pattern):
+            if not path.is_file():
+                continue
+            body = path.read_bytes()
+            etag = f'"{hashlib.sha1(body).hexdigest()}"'
+            content_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+            static_files[path.relative_to(project_root).as_posix()] = (body, etag, content_type)
+    return static_files
+
+
+def start_web_server(project_root: Path, port: int) -> http.server.ThreadingHTTPServer:
+    """
+    Запустить HTTP-сервер для раздачи HTML файла.
+
+    Порт привязывается до возврата из функции, так что браузер можно
+    открывать сразу, не дожидаясь старта цикла обработки запросов.
+    """
+    import http.server
+
+    static_files = _load_static_files(project_root)
+
+    class CustomHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
+        """
+        HTTP обработчик с поддержкой CORS для веб-интерфейса.
+
+        Файлы интерфейса отдаются из памяти с ETag; остальное — с диска.
+        """
+
+        # HTTP/1.1: браузер переиспользует соединения (keep-alive)
+        protocol_version = "HTTP/1.1"
+
+        def end_headers(self):
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
+            self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+            if not self.close_connection:
+                self.send_header('Connection', 'keep-alive')
+            super().end_headers()
+
+        def do_GET(self):
+            if not self._send_static(with_body=True):
+                super().do_GET()
+
+        def do_HEAD(self):
+            if not self._send_static(with_body=False):
+                super().do_HEAD()
+
+        def _send_static(self, with_body: bool) -> bool:
+            """Отдать файл из памяти; False — если его нет в кэше."""
+            rel_path = self.path.split("?", 1)[0].split("#", 1)[0].lstrip("/")
+            entry = static_files.get(rel_path)
+            if entry is None:
+                return False
+            body, etag, content_type = entry
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Cache-Control", "no-cache")
+                self.end_headers()
+                return True
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", etag)
+            # Браузер хранит файл, но каждый раз сверяет ETag: обновлённый
+            # интерфейс подхватывается сразу, неизменный приходит как 304
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            if with_body:
+                self.wfile.write(body)
+            return True
+
+        def log_message(self, format, *args):
+            # Отключаем логирование каждого запроса для чистоты консоли
+            pass
+
+    # Каталог передаём обработчику напрямую, без os.chdir для всего процесса.
+    # Многопоточный сервер отдаёт HTML и ресурсы страницы параллельно.
+    # Слушаем только 127.0.0.1: интерфейс локальный, и брандмауэр не спрашивает.
+    handler = functools.partial(CustomHTTPRequestHandler, directory=str(project_root))
+    httpd = http.server.ThreadingHTTPServer(("127.0.0.1", port), handler)
     
-    thread = threading.Thread(target=serve, daemon=True)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
     thread.start()
     return httpd
 
 
-def start_api_server(project_root: Path) -> tuple[str, Any]:
+def start_api_server() -> tuple[Any, threading.Thread]:
     """
-    Запустить API-сервер.
+    Запустить API-сервер в отдельном потоке этого же процесса.
 
-    Возвращает:
-      ("subprocess", process) для обычного запуска
-      ("embedded", (server, thread)) для frozen-режима (exe)
+    Второй интерпретатор не нужен, а модули расчёта загружаются один раз.
+    Возвращает (server, thread).
     """
-    # В собранном exe нельзя запускать web_api.py как отдельный скрипт.
-    # Поэтому поднимаем FastAPI внутри отдельного потока.
-    if getattr(sys, "frozen", False):
-        import uvicorn
-        from web_api import app
-
-        print(f"Запуск API на порту {API_PORT} (embedded)...")
-        config = uvicorn.Config(app, host="127.0.0.1", port=API_PORT, log_level="info")
-        server = uvicorn.Server(config)
-        thread = threading.Thread(target=server.run, daemon=True)
-        thread.start()
-        return "embedded", (server, thread)
-
-    python_exe = sys.executable
-    api_script = project_root / "web_api.py"
-    
-    if not api_script.exists():
-        raise FileNotFoundError(f"Файл {api_script} не найден")
-    
+    # Ошибки импорта (например, не установлены зависимости) всплывут здесь же.
+    import uvicorn
+    from web_api import app
+
     print(f"Запуск API на порту {API_PORT}...")
-    # Важно: не прячем вывод. Если зависимостей нет/ошибка импорта — пользователь сразу увидит.
-    process = subprocess.Popen(
-        [python_exe, str(api_script)],
-        cwd=str(project_root),
+    # Явно: один воркер в этом процессе, без reload и без spawn дочерних процессов
+    config = uvicorn.Config(
+        app,
+        host="127.0.0.1",
+        port=API_PORT,
+        workers=1,
+        loop="asyncio",
+        lifespan="on",
+        reload=False,
+        use_colors=False,
+        log_level="warning",
     )
-    return "subprocess", process
+    server = uvicorn.Server(config)
+
+    def run() -> None:
+        try:
+            server.run()
+        finally:
+            # API остановился (штатно или с ошибкой) — будим main()
+            _shutdown.set()
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return server, thread
 
 
-def wait_for_api(api_mode: str, api_handle: Any, port: int, timeout_s: int = 30) -> bool:
+def _stop_api_server(api_server: Any, api_thread: threading.Thread) -> None:
+    """Попросить uvicorn завершиться и дождаться потока."""
+    api_server.should_exit = True
+    api_thread.join(timeout=2)
+
+
+def wait_for_api(api_server: Any, api_thread: threading.Thread, timeout_s: int = 30) -> bool:
     """
     Подождать, пока API станет доступен.
 
-    Если процесс API завершился раньше — сразу возвращаем False.
+    Если поток API завершился раньше — сразу возвращаем False: он выставляет
+    _shutdown при выходе, и ожидание между проверками прерывается.
     """
-    import socket
-
     deadline = time.time() + timeout_s
+    # Начинаем с частых проверок и увеличиваем интервал: при быстром
+    # старте API не ждём лишние полсекунды, при медленном — не частим.
+    delay = 0.01
     while time.time() < deadline:
-        # Если API-носитель уже умер — не ждём дальше
-        if api_mode == "subprocess":
-            if api_handle.poll() is not None:
-                return False
-        else:
-            _, api_thread = api_handle
-            if not api_thread.is_alive():
-                return False
-
-        try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(0.5)
-            result = sock.connect_ex(("127.0.0.1", port))
-            sock.close()
-            if result == 0:
-                return True
-        except Exception:
-            pass
+        # Если поток API уже умер (порт занят, ошибка в приложении) — не ждём дальше
+        if not api_thread.is_alive():
+            return False
+        # uvicorn сам отмечает, что сокет открыт и приложение запущено
+        if api_server.started:
+            return True
 
-        time.sleep(0.5)
+        if _shutdown.wait(delay):
+            # Поток API выходит (событие выставляется в его finally)
+            api_thread.join(timeout=1)
+            return False
+        delay = min(delay * 1.6, 0.5)
 
     return False
 
 
 def main() -> None:
+    import webbrowser
+
     project_root = get_runtime_root()
     
     print("=" * 60)
@@ -154,83 +247,75 @@ def main() -> None:
     
     # Запускаем API
     try:
-        api_mode, api_handle = start_api_server(project_root)
+        api_server, api_thread = start_api_server()
     except Exception as e:
         print(f"[ERROR] Ошибка запуска API: {e}")
         sys.exit(1)
     
+    # Веб-сервер (новая версия фронтенда) поднимаем, пока API ещё стартует
+    # в своём потоке: время запуска — максимум из двух, а не их сумма.
+    web_url = f"http://localhost:{WEB_PORT}/web_interface_v2.html"
+    try:
+        web_server = start_web_server(project_root, WEB_PORT)
+    except Exception as e:
+        print(f"[ERROR] Ошибка запуска веб-сервера: {e}")
+        _stop_api_server(api_server, api_thread)
+        sys.exit(1)
+
+    # Печатаем из основного потока: вывод не перемешивается с остальным
+    print(f"Веб-сервер запущен на http://localhost:{WEB_PORT}")
+
     # Ждём, пока API поднимется
     print("Ожидание запуска API...")
-    if not wait_for_api(api_mode, api_handle, API_PORT):
-        # Если процесс завершился — дадим более понятную подсказку
-        if api_mode == "subprocess" and api_handle.poll() is not None:
+    if not wait_for_api(api_server, api_thread):
+        if not api_thread.is_alive():
             print("[ERROR] API завершился сразу после запуска.")
         else:
             print("[ERROR] API не запустился за отведённое время.")
 
         print("")
-        print("Подсказка: чаще всего это происходит, если не установлены зависимости.")
-        print("Установите их один раз командой:")
+        print("Подсказка: чаще всего это происходит, если не установлены зависимости")
+        print("или порт уже занят другой программой.")
+        print("Установите зависимости один раз командой:")
         print("  pip install -r requirements.txt")
         print("")
-        if api_mode == "subprocess":
-            api_handle.terminate()
-        else:
-            api_server, api_thread = api_handle
-            api_server.should_exit = True
-            api_thread.join(timeout=5)
+        web_server.shutdown()
+        _stop_api_server(api_server, api_thread)
         sys.exit(1)
     
     print(f"[OK] API запущен на http://localhost:{API_PORT}")
+
+    # Дальше Ctrl+C только выставляет событие; остановка — в конце main()
+    signal.signal(signal.SIGINT, lambda *_: _shutdown.set())
     
-    # Запускаем веб-сервер
-    try:
-        web_server = start_web_server(project_root, WEB_PORT)
-    except Exception as e:
-        print(f"[ERROR] Ошибка запуска веб-сервера: {e}")
-        if api_mode == "subprocess":
-            api_handle.terminate()
-        else:
-            api_server, api_thread = api_handle
-            api_server.should_exit = True
-            api_thread.join(timeout=5)
-        sys.exit(1)
-    
-    # Открываем браузер (используем новую версию фронтенда)
-    web_url = f"http://localhost:{WEB_PORT}/web_interface_v2.html"
     print(f"Открываю веб-интерфейс: {web_url}")
-    time.sleep(0.5)  # Небольшая задержка перед открытием браузера
-    webbrowser.open(web_url)
     
     print("=" * 60)
     print("[OK] Всё готово! Веб-интерфейс открыт в браузере.")
     print("   Нажмите Ctrl+C для остановки серверов.")
     print("=" * 60)
+
+    # Браузер открываем только после готовности API: страница сразу
+    # запрашивает /racks и не умеет повторять запрос.
+    # Запускаем по таймеру уже после баннера: основной поток сразу
+    # переходит к ожиданию, а не ждёт запуска процесса браузера.
+    # open_new_tab — вкладка в уже открытом окне при повторных запусках.
+    browser_timer = threading.Timer(BROWSER_OPEN_DELAY_S, webbrowser.open_new_tab, args=(web_url,))
+    browser_timer.daemon = True
+    browser_timer.start()
     
     try:
-        # Держим процессы запущенными
-        if api_mode == "subprocess":
-            api_handle.wait()
-        else:
-            _, api_thread = api_handle
-            while api_thread.is_alive():
-                time.sleep(0.5)
+        # Держим процесс запущенным без периодических пробуждений
+        while not _shutdown.wait(_SHUTDOWN_WAIT_S):
+            pass
     except KeyboardInterrupt:
-        print("\n\nОстановка серверов...")
-        web_server.shutdown()
-        if api_mode == "subprocess":
-            api_handle.terminate()
-            try:
-                api_handle.wait(timeout=5)
-            except subprocess.TimeoutExpired:
-                api_handle.kill()
-        else:
-            api_server, api_thread = api_handle
-            api_server.should_exit = True
-            api_thread.join(timeout=5)
-        print("[OK] Серверы остановлены")
+        pass
+
+    print("\n\nОстановка серверов...")
+    web_server.shutdown()
+    _stop_api_server(api_server, api_thread)
+    print("[OK] Серверы остановлены")
 
 
 if __name__ == "__main__":
     main()
-
@@ -4,15 +4,22 @@ REST API для расчёта длины патч-кордов.
 Или: python web_api.py
 """
 
-from fastapi import FastAPI, HTTPException
-from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
-from typing import Optional, Dict, List
+import math
+import threading
+from contextlib import asynccontextmanager
+from functools import lru_cache
+
+import orjson
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Optional, Dict, List, Tuple
 
 from cable_calculator import (
-    ServerLocation,
-    DataCenterCableConfig,
-    calculate_patch_cord_breakdown,
+    PATCH_CORD_OPTIONS_M,
+    CableLengthBreakdown,
+    calculate_patch_cord_breakdown_fast,
 )
 from rack_plan import (
     RackInfo,
@@ -21,49 +28,190 @@ from rack_plan import (
     generate_default_rack_plan,
 )
 
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    # План стоек читаем в фоне: сервер уже принимает запросы (/health
+    # отвечает сразу), а к первому /racks план, скорее всего, готов.
+    threading.Thread(target=_racks_response, daemon=True).start()
+    yield
+
+
 app = FastAPI(
     title="Калькулятор патч-кордов",
     description="API для расчёта длины патч-кордов в дата-центре",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=_lifespan,
 )
 
+
+def _json_response(payload: dict, status_code: int = 200) -> Response:
+    """
+    JSON-ответ через orjson: быстрее stdlib json (особенно на float)
+    и сразу отдаёт bytes. NaN/Infinity записываются как null.
+    """
+    return Response(
+        content=orjson.dumps(payload),
+        status_code=status_code,
+        media_type="application/json",
+    )
+
+# Готовые CORS-заголовки (разрешаем любой origin, как allow_origins=["*"]
+# с allow_credentials=True: origin запроса возвращается как есть)
+_CORS_CREDENTIALS = (b"access-control-allow-credentials", b"true")
+_CORS_VARY = (b"vary", b"Origin")
+_CORS_PREFLIGHT_HEADERS = [
+    (b"access-control-allow-methods", b"DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"),
+    (b"access-control-max-age", b"600"),
+    (b"content-type", b"text/plain; charset=utf-8"),
+    (b"content-length", b"2"),
+]
+
+
+class SimpleCORSMiddleware:
+    """
+    Минимальный CORS-middleware (ASGI) для веб-интерфейса.
+
+    Запросы без заголовка Origin (проверки /health, вызовы сервер-сервер)
+    проходят без какой-либо обработки. Для запросов с Origin добавляем
+    Access-Control-* заголовки, preflight (OPTIONS) отвечаем сами.
+    В продакшене стоит ограничить список разрешённых доменов.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin = None
+        request_method = None
+        request_headers = None
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"access-control-request-method":
+                request_method = value
+            elif name == b"access-control-request-headers":
+                request_headers = value
+
+        if origin is None:
+            await self.app(scope, receive, send)
+            return
+
+        cors_headers = [(b"access-control-allow-origin", origin), _CORS_CREDENTIALS, _CORS_VARY]
+
+        if scope["method"] == "OPTIONS" and request_method is not None:
+            headers = cors_headers + _CORS_PREFLIGHT_HEADERS
+            if request_headers is not None:
+                headers.append((b"access-control-allow-headers", request_headers))
+            await send({"type": "http.response.start", "status": 200, "headers": headers})
+            await send({"type": "http.response.body", "body": b"OK"})
+            return
+
+        async def send_with_cors(message):
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", ()), *cors_headers]}
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
+
+
 # Разрешаем CORS для веб-интерфейса
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # В продакшене указать конкретные домены
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+app.add_middleware(SimpleCORSMiddleware)
+
+
+@app.exception_handler(RequestValidationError)
+async def validation_exception_handler(request: Request, exc: RequestValidationError):
+    """
+    Ответ 422 в том же формате, что у FastAPI, но через orjson.
+
+    Стандартный обработчик возвращает исходное значение поля через json.dumps
+    и падает на NaN/Infinity; orjson записывает их как null.
+
+    Ошибки в параметрах config отдаём как раньше: 400 и строка в detail —
+    её показывает старый web_interface.html.
+    """
+    errors = exc.errors()
+    if errors and all(_is_config_field_error(err) for err in errors):
+        return _json_response({"detail": _config_error_message(errors[0])}, status_code=400)
+    return _json_response({"detail": jsonable_encoder(errors)}, status_code=422)
+
+
+def _is_config_field_error(err: dict) -> bool:
+    """Ошибка относится к полю внутри config (а не к config целиком)."""
+    loc = err.get("loc", ())
+    return len(loc) > 2 and loc[0] == "body" and loc[1] == "config"
+
+
+def _config_error_message(err: dict) -> str:
+    """Человекочитаемый текст ошибки параметра config."""
+    name = err["loc"][2]
+    if err.get("type") == "greater_than_equal":
+        return f"Параметр {name} не может быть отрицательным."
+    return f"Параметр {name} должен быть числом."
+
+
+# Общие настройки моделей: неизвестные поля — ошибка 422, экземпляры
+# неизменяемые, пробелы по краям строк (например, в коде стойки) срезаются
+# ещё при валидации — тогда код сразу находится в _rack_idx().
+_MODEL_CONFIG = ConfigDict(extra="forbid", frozen=True, str_strip_whitespace=True)
 
 
 class ServerRequest(BaseModel):
     """Запрос с параметрами сервера."""
+    model_config = _MODEL_CONFIG
+
     rack_code: str = Field(..., description="Код стойки (например, '02b05')")
     unit: int = Field(..., ge=1, le=50, description="Номер юнита (1-50)")
     hostname: Optional[str] = Field(None, description="Опциональный хостнейм сервера")
 
 
+class CalculationConfig(BaseModel):
+    """Необязательные параметры расчёта."""
+    # Лишние ключи игнорируем: старый web_interface.html присылает ещё
+    # rounding_step_m, который расчёт больше не использует.
+    # NaN/inf не принимаем — это не длина.
+    model_config = ConfigDict(
+        extra="ignore", frozen=True, str_strip_whitespace=True, allow_inf_nan=False
+    )
+
+    safety_slack_cm: Optional[float] = Field(
+        None, ge=0, description="Страховочный запас, см (по умолчанию 40)"
+    )
+    cross_rack_slack_m: Optional[float] = Field(
+        None, ge=0,
+        description="Устаревший ключ: страховочный запас, м (если safety_slack_cm не задан)",
+    )
+
+
 class CalculationRequest(BaseModel):
     """Запрос на расчёт длины патч-корда."""
+    model_config = _MODEL_CONFIG
+
     server_a: ServerRequest
     server_b: ServerRequest
-    config: Optional[dict] = Field(None, description="Опциональные параметры конфигурации")
+    config: Optional[CalculationConfig] = Field(None, description="Опциональные параметры конфигурации")
 
 
 class CalculationResponse(BaseModel):
     """Ответ с результатом расчёта с детализацией."""
+    model_config = _MODEL_CONFIG
 
-    length_m: float = Field(..., description="Расчётная длина по формулам, м (до округления)")
+    length_m: float = Field(..., description="Расчётная длина по формулам, м (до подбора патч-корда; с точностью до мм)")
     recommended_patch_cord_m: float = Field(..., description="Рекомендуемый патч-корд из списка (1, 1.5, 2, 3, 5, 7.5, 10, 15, 20 м)")
     same_rack: bool = Field(..., description="Находятся ли серверы в одной стойке")
 
     # Детализация по сегментам
-    vertical_a_m: float = Field(..., description="Вертикальный участок от сервера A до кабель-канала, м")
-    vertical_b_m: float = Field(..., description="Вертикальный участок от сервера B до кабель-канала, м")
-    horizontal_m: float = Field(..., description="Горизонтальный участок по кабель-каналу, м")
-    raw_total_m: float = Field(..., description="Суммарная расчётная длина до округления, м")
-    slack_added_m: float = Field(..., description="Добавленный запас по длине (м) для разных стоек")
+    # Длины сегментов округлены до 3 знаков (мм): большая точность для
+    # подбора патч-корда не нужна, а ответ короче.
+    vertical_a_m: float = Field(..., description="Вертикальный участок от сервера A до кабель-канала, м (с точностью до мм)")
+    vertical_b_m: float = Field(..., description="Вертикальный участок от сервера B до кабель-канала, м (с точностью до мм)")
+    horizontal_m: float = Field(..., description="Горизонтальный участок по кабель-каналу, м (с точностью до мм)")
+    raw_total_m: float = Field(..., description="Суммарная расчётная длина до округления до патч-корда, м (с точностью до мм)")
+    slack_added_m: float = Field(..., description="Добавленный запас по длине (м) для разных стоек (с точностью до мм)")
 
     server_a: ServerRequest
     server_b: ServerRequest
@@ -71,6 +219,7 @@ class CalculationResponse(BaseModel):
 
 class RackInfoResponse(BaseModel):
     """Информация о стойке для фронтенда."""
+    model_config = _MODEL_CONFIG
 
     code: str = Field(..., description="Код стойки из плана (например, '02b05')")
     index: int = Field(..., description="Порядковый индекс стойки в ряду (для расчёта расстояний)")
@@ -78,50 +227,129 @@ class RackInfoResponse(BaseModel):
 
 class RacksListResponse(BaseModel):
     """Ответ со списком доступных стоек."""
+    model_config = _MODEL_CONFIG
 
     racks: List[RackInfoResponse]
 
 
-# Загружаем план стоек при старте приложения.
-# Если Excel-файл отсутствует или его структура непредвиденная,
-# используем дефолтный диапазон 02b03–02b18.
-try:
-    RACK_INFOS, RACK_CODE_TO_INFO = load_rack_plan()
-except Exception as e:
-    # В боевом коде можно логировать причину в файл/лог-систему.
-    print(f"[rack_plan] Не удалось загрузить план стоек из Excel: {e}")
-    print("[rack_plan] Используется дефолтный диапазон стоек 02b03–02b18.")
-    RACK_INFOS, RACK_CODE_TO_INFO = generate_default_rack_plan()
+# lru_cache не мешает двум потокам одновременно начать первый вызов:
+# фоновый прогрев и первый запрос читали бы Excel дважды
+_RACK_PLAN_LOCK = threading.Lock()
+
+
+def _rack_plan() -> Tuple[List[RackInfo], Dict[str, RackInfo]]:
+    """
+    План стоек: загружается при первом обращении, а не при импорте модуля.
+
+    Параллельные первые вызовы ждут одну загрузку.
+    """
+    with _RACK_PLAN_LOCK:
+        return _load_rack_plan_once()
+
+
+@lru_cache(maxsize=1)
+def _load_rack_plan_once() -> Tuple[List[RackInfo], Dict[str, RackInfo]]:
+    """
+    Прочитать план стоек из Excel.
+
+    Если Excel-файл отсутствует или его структура непредвиденная,
+    используем дефолтный диапазон 02b03–02b18.
+    """
+    try:
+        return load_rack_plan()
+    except Exception as e:
+        # В боевом коде можно логировать причину в файл/лог-систему.
+        print(f"[rack_plan] Не удалось загрузить план стоек из Excel: {e}")
+        print("[rack_plan] Используется дефолтный диапазон стоек 02b03–02b18.")
+        return generate_default_rack_plan()
+
+
+# Ответы, которые не меняются после старта, создаём один раз и отдаём
+# один и тот же объект: тело уже сериализовано, заголовки готовы,
+# а Response при отправке не изменяется.
+_ROOT_RESPONSE = _json_response({
+    "message": "API калькулятора патч-кордов",
+    "version": "1.0.0",
+    "endpoints": {
+        "/calculate": "POST - расчёт длины патч-корда",
+        "/health": "GET - проверка работоспособности",
+        "/racks": "GET - список доступных стоек"
+    }
+})
+_HEALTH_RESPONSE = _json_response({"status": "ok"})
+
+
+@lru_cache(maxsize=1)
+def _rack_idx() -> Dict[str, int]:
+    """
+    Код стойки -> индекс одним словарём (плюс вариант в нижнем регистре),
+    чтобы /calculate обходился без поиска по RackInfo на каждый код.
+    """
+    rack_idx: Dict[str, int] = {}
+    for info in _rack_plan()[0]:
+        rack_idx[info.code] = info.index
+        rack_idx.setdefault(info.code.lower(), info.index)
+    return rack_idx
+
+
+@lru_cache(maxsize=1)
+def _racks_response() -> Response:
+    """Ответ /racks: создаётся один раз при первом запросе."""
+    body = RacksListResponse(
+        racks=[RackInfoResponse(code=info.code, index=info.index) for info in _rack_plan()[0]]
+    ).model_dump_json().encode("utf-8")
+    return Response(content=body, media_type="application/json")
 
 
 @app.get("/")
 async def root():
     """Корневой endpoint с информацией об API."""
-    return {
-        "message": "API калькулятора патч-кордов",
-        "version": "1.0.0",
-        "endpoints": {
-            "/calculate": "POST - расчёт длины патч-корда",
-            "/health": "GET - проверка работоспособности",
-            "/racks": "GET - список доступных стоек"
-        }
-    }
+    return _ROOT_RESPONSE
 
 
 @app.get("/health")
 async def health():
     """Проверка работоспособности API."""
-    return {"status": "ok"}
+    return _HEALTH_RESPONSE
 
 
-@app.get("/racks", response_model=RacksListResponse)
+@app.get("/racks", responses={200: {"model": RacksListResponse}})
 async def get_racks():
     """Вернуть список доступных стоек (02b03–02b18) для фронтенда."""
-    racks = [RackInfoResponse(code=info.code, index=info.index) for info in RACK_INFOS]
-    return RacksListResponse(racks=racks)
+    return _racks_response()
 
 
-@app.post("/calculate", response_model=CalculationResponse)
+def _rack_index(code: str) -> int:
+    """Индекс стойки по коду без учёта пробелов и регистра; KeyError, если не найден."""
+    rack_idx = _rack_idx()
+    index = rack_idx.get(code.strip()) or rack_idx.get(code.strip().lower())
+    if index is None:
+        # Текст ошибки — как у rack_plan.get_rack_index_by_code
+        return get_rack_index_by_code(code, _rack_plan()[1])
+    return index
+
+
+# Кэшируем только запас не длиннее самого длинного патч-корда: больший
+# на практике не встречается, а при квантовании может переполниться.
+_MAX_CACHED_SLACK_CM = PATCH_CORD_OPTIONS_M[-1] * 100
+
+
+# Интерфейс повторяет одни и те же запросы при мелких правках формы,
+# поэтому результат кэшируем по целочисленному ключу. Запас квантуем
+# до миллиметра: так ключ не зависит от погрешностей float.
+# Пары (A, B) не упорядочиваем: расчёт несимметричен (вертикали A и B
+# считаются по разным таблицам).
+@lru_cache(maxsize=4096)
+def _compute(ai: int, au: int, bi: int, bu: int, slack_mm: int) -> CableLengthBreakdown:
+    """Расчёт по индексам стоек, юнитам и страховочному запасу в миллиметрах."""
+    return CableLengthBreakdown(
+        *calculate_patch_cord_breakdown_fast(ai, au, bi, bu, slack_mm / 1000.0)
+    )
+
+
+# Ответ собираем словарём без повторной валидации через CalculationResponse;
+# модель остаётся в OpenAPI как описание схемы.
+@app.post("/calculate", responses={200: {"model": CalculationResponse}})
 async def calculate_cable_length(request: CalculationRequest):
     """
     Рассчитать длину патч-корда для коммутации двух серверов.
@@ -139,63 +367,73 @@ async def calculate_cable_length(request: CalculationRequest):
     """
     try:
         # Получаем индексы стоек по их кодам
+        rack_idx = _rack_idx()
         try:
-            rack_a_index = get_rack_index_by_code(request.server_a.rack_code, RACK_CODE_TO_INFO)
-            rack_b_index = get_rack_index_by_code(request.server_b.rack_code, RACK_CODE_TO_INFO)
-        except KeyError as e:
-            raise HTTPException(status_code=400, detail=str(e))
-
-        # Создаём объекты серверов с числовыми индексами стоек
-        server_a = ServerLocation(rack=rack_a_index, unit=request.server_a.unit)
-        server_b = ServerLocation(rack=rack_b_index, unit=request.server_b.unit)
+            rack_a_index = rack_idx[request.server_a.rack_code]
+            rack_b_index = rack_idx[request.server_b.rack_code]
+        except KeyError:
+            # Медленный путь: пробелы/регистр или неизвестный код
+            try:
+                rack_a_index = _rack_index(request.server_a.rack_code)
+                rack_b_index = _rack_index(request.server_b.rack_code)
+            except KeyError as e:
+                raise HTTPException(status_code=400, detail=str(e))
 
-        # Читаем настраиваемый страховочный запас (см) из запроса.
+        # Страховочный запас (см): типы и границы уже проверил pydantic.
         # Поддерживаем старый ключ cross_rack_slack_m для совместимости.
-        cfg_dict = request.config or {}
-        safety_slack_cm_raw = cfg_dict.get("safety_slack_cm")
-        if safety_slack_cm_raw is None:
-            cross_rack_slack_m_raw = cfg_dict.get("cross_rack_slack_m")
-            if cross_rack_slack_m_raw is not None:
-                try:
-                    safety_slack_cm_raw = float(cross_rack_slack_m_raw) * 100.0
-                except (TypeError, ValueError):
-                    raise HTTPException(
-                        status_code=400,
-                        detail="Параметр cross_rack_slack_m должен быть числом.",
-                    )
-
-        if safety_slack_cm_raw is None:
-            safety_slack_cm = 40.0
-        else:
-            try:
-                safety_slack_cm = float(safety_slack_cm_raw)
-            except (TypeError, ValueError):
+        cfg = request.config
+        if cfg is not None and cfg.safety_slack_cm is not None:
+            safety_slack_cm = cfg.safety_slack_cm
+        elif cfg is not None and cfg.cross_rack_slack_m is not None:
+            safety_slack_cm = cfg.cross_rack_slack_m * 100.0
+            if not math.isfinite(safety_slack_cm):
+                # Конечное число метров может переполниться при переводе в см
                 raise HTTPException(
                     status_code=400,
                     detail="Параметр safety_slack_cm должен быть числом.",
                 )
-            if safety_slack_cm < 0:
-                raise HTTPException(
-                    status_code=400,
-                    detail="Параметр safety_slack_cm не может быть отрицательным.",
-                )
-
-        cfg = DataCenterCableConfig(safety_slack_m=safety_slack_cm / 100.0)
-        breakdown = calculate_patch_cord_breakdown(server_a, server_b, cfg)
-
-        return CalculationResponse(
-            length_m=breakdown.raw_total_m,
-            recommended_patch_cord_m=breakdown.recommended_patch_cord_m,
-            same_rack=breakdown.same_rack,
-            vertical_a_m=breakdown.vertical_a_m,
-            vertical_b_m=breakdown.vertical_b_m,
-            horizontal_m=breakdown.horizontal_m,
-            raw_total_m=breakdown.raw_total_m,
-            slack_added_m=breakdown.slack_added_m,
-            server_a=request.server_a,
-            server_b=request.server_b,
-        )
+        else:
+            safety_slack_cm = 40.0
 
+        if safety_slack_cm <= _MAX_CACHED_SLACK_CM:
+            breakdown = _compute(
+                rack_a_index,
+                request.server_a.unit,
+                rack_b_index,
+                request.server_b.unit,
+                round(safety_slack_cm * 10.0),
+            )
+        else:
+            # Огромный запас не квантуем: перевод в миллиметры может
+            # переполниться, а кэшировать такие запросы незачем
+            breakdown = CableLengthBreakdown(
+                *calculate_patch_cord_breakdown_fast(
+                    rack_a_index,
+                    request.server_a.unit,
+                    rack_b_index,
+                    request.server_b.unit,
+                    safety_slack_cm / 100.0,
+                )
+            )
+
+        # Длины — до миллиметра (см. CalculationResponse): без хвостов
+        # вида 10.200000000000001 в JSON
+        raw_total_m = round(breakdown.raw_total_m, 3)
+        return _json_response({
+            "length_m": raw_total_m,
+            "recommended_patch_cord_m": breakdown.recommended_patch_cord_m,
+            "same_rack": breakdown.same_rack,
+            "vertical_a_m": round(breakdown.vertical_a_m, 3),
+            "vertical_b_m": round(breakdown.vertical_b_m, 3),
+            "horizontal_m": round(breakdown.horizontal_m, 3),
+            "raw_total_m": raw_total_m,
+            "slack_added_m": round(breakdown.slack_added_m, 3),
+            "server_a": request.server_a.model_dump(),
+            "server_b": request.server_b.model_dump(),
+        })
+
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
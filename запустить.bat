@@ -22,7 +22,7 @@ if errorlevel 1 (
 
 REM Проверяем наличие зависимостей
 echo Проверка зависимостей...
-python -c "import fastapi" >nul 2>&1
+python -c "import fastapi, orjson" >nul 2>&1
 if errorlevel 1 (
     echo.
     echo [ИНФО] Зависимости не установлены. Устанавливаю...